@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import IO, Any, Callable, Union
+from typing import IO, Any, Iterator, List, Optional, Tuple, Union
+import io
 import os
+import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 
 class DataSource(str, Enum):
     API = 'api'
@@ -15,6 +22,7 @@ class DataSource(str, Enum):
 
 class FileFormat(str, Enum):
     CSV = 'csv'
+    FEATHER = 'feather'
     JSON = 'json'
     PARQUET = 'parquet'
 
@@ -23,6 +31,41 @@ class ExportWritePolicy(str, Enum):
     FAIL = 'fail'
     REPLACE = 'replace'
 
+# FileFormat members hash and compare equal to their values, so these also
+# resolve raw format strings such as 'csv'.
+_READERS = {
+    FileFormat.CSV: pd.read_csv,
+    FileFormat.FEATHER: pd.read_feather,
+    FileFormat.JSON: pd.read_json,
+    FileFormat.PARQUET: pd.read_parquet,
+}
+
+_WRITERS = {
+    FileFormat.CSV: 'to_csv',
+    FileFormat.FEATHER: 'to_feather',
+    FileFormat.JSON: 'to_json',
+    FileFormat.PARQUET: 'to_parquet',
+}
+
+# pandas style read_csv arguments the pyarrow CSV reader understands.
+_ARROW_CSV_KWARGS = {'sep', 'dtype', 'parse_dates'}
+
+# Unquoted SQL identifier, used to keep user supplied schema/table names
+# from injecting SQL into generated queries.
+_SQL_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_$]*')
+
+def _arrow_types_mapper(arrow_type: pa.DataType) -> pd.api.extensions.ExtensionDtype:
+    """
+    Maps arrow types to arrow-backed pandas dtypes. Strings use the
+    pyarrow StringDtype, which supports the whole .str accessor, and
+    dictionaries are left to pyarrow, which reads them as categoricals.
+    """
+    if pa.types.is_dictionary(arrow_type):
+        return None
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype('pyarrow')
+    return pd.ArrowDtype(arrow_type)
+
 class BaseIO(ABC):
     """
     Data loader interface. All data loaders must inherit from this interface.
@@ -58,31 +101,165 @@ class BaseFile(BaseIO):
     def _get_file_format(self, filepath):
         return os.path.splitext(os.path.basename(filepath))[-1][1:]
     
-    def __get_reader(self, format: Union[FileFormat, str]) -> Callable:
+    def __get_arrow_types(self, dtype: Optional[dict]) -> dict:
         """
-        Gets data frame reader based on file format
+        Translates a pandas style dtype mapping to arrow column types
         Args:
-            format (Union[FileFormat, str]): Format to get reader for.
-        Raises:
-            ValueError: Raised if invalid format specified.
+            dtype (dict, Optional): Mapping of column name to type, e.g.
+            {'loan_id': str}. Arrow data types are kept as they are.
         Returns:
-            Callable: Returns the reader function that reads a dataframe from file
-        """
-        if format == FileFormat.CSV:
-            return pd.read_csv
-        elif format == FileFormat.JSON:
-            return pd.read_json
-        elif format == FileFormat.PARQUET:
-            return pd.read_parquet
-        else:
-            raise ValueError(f'Invalid format \'{format}\' specified.')
-    
+            dict: Mapping of column name to arrow data type.
+        """
+        return {
+            col: col_type if isinstance(col_type, pa.DataType)
+            else pa.from_numpy_dtype(np.dtype(col_type))
+            for col, col_type in (dtype or {}).items()
+        }
+
+    def __arrow_csv_supported(self, input: Union[IO, os.PathLike], kwargs: dict) -> bool:
+        """
+        Tells whether the pyarrow CSV reader can honour the pandas style
+        arguments given.
+        Args:
+            input (Union[IO, os.PathLike]): Input buffer or filepath to read.
+            kwargs (dict): Reader arguments.
+        Returns:
+            bool: False if any argument or dtype has no arrow equivalent, or
+            if input is a text stream or a stream that can't be read twice.
+        """
+        if not set(kwargs) <= _ARROW_CSV_KWARGS:
+            return False
+        sep = kwargs.get('sep', ',')
+        if not (isinstance(sep, str) and len(sep) == 1):
+            return False
+        dtype = kwargs.get('dtype')
+        if dtype is not None and not isinstance(dtype, dict):
+            return False
+        parse_dates = kwargs.get('parse_dates')
+        if parse_dates is not None and not (
+                isinstance(parse_dates, list) and all(isinstance(col, str) for col in parse_dates)):
+            return False
+        if not isinstance(input, (str, os.PathLike)) and (
+                isinstance(input, io.TextIOBase) or not input.seekable()):
+            return False
+        try:
+            self.__get_arrow_types(dtype)
+        except (TypeError, NotImplementedError, pa.ArrowInvalid):
+            return False
+        return True
+
+    def __read_csv_table(
+        self,
+        input: Union[IO, os.PathLike],
+        columns: Optional[List[str]] = None,
+        sep: str = ',',
+        dtype: Optional[dict] = None,
+        parse_dates: Optional[List[str]] = None,
+    ) -> pa.Table:
+        """
+        Reads a CSV into an arrow table, parsing blocks in parallel. Like
+        pandas, only parse_dates columns are read as dates: other columns
+        arrow infers as dates or times are read again as strings.
+        Args:
+            input (Union[IO, os.PathLike]): Input buffer or filepath to read
+            table from. Buffers must be seekable binary streams.
+            columns (List[str], Optional): Columns to read.
+            sep (str): Field delimiter. Defaults to ','.
+            dtype (dict, Optional): Mapping of column name to type.
+            parse_dates (List[str], Optional): Columns to keep as dates.
+        Returns:
+            Table: Arrow table read from the specified source.
+        """
+        start = None if isinstance(input, (str, os.PathLike)) else input.tell()
+        read_options = pa_csv.ReadOptions(use_threads=True, block_size=64 << 20)
+        parse_options = pa_csv.ParseOptions(delimiter=sep)
+        column_types = self.__get_arrow_types(dtype)
+        table = pa_csv.read_csv(input,
+                                read_options=read_options,
+                                parse_options=parse_options,
+                                convert_options=pa_csv.ConvertOptions(
+                                    include_columns=columns or [],
+                                    column_types=column_types,
+                                    strings_can_be_null=True))
+
+        temporal = [field.name for field in table.schema
+                    if pa.types.is_temporal(field.type)
+                    and field.name not in column_types
+                    and field.name not in (parse_dates or [])]
+        if not temporal:
+            return table
+
+        if start is not None:
+            input.seek(start)
+        strings = pa_csv.read_csv(input,
+                                  read_options=read_options,
+                                  parse_options=parse_options,
+                                  convert_options=pa_csv.ConvertOptions(
+                                      include_columns=temporal,
+                                      column_types=dict.fromkeys(temporal, pa.string()),
+                                      strings_can_be_null=True))
+        for name in temporal:
+            table = table.set_column(table.schema.get_field_index(name), name, strings[name])
+        return table
+
+    def __read_table(
+        self,
+        input: Union[IO, os.PathLike],
+        format: Union[FileFormat, str],
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple]] = None,
+        **kwargs,
+    ) -> pa.Table:
+        """
+        Reads an arrow table from the filepath or buffer specified, pushing
+        column selection and row filters down to the reader.
+        Args:
+            input (Union[IO, os.PathLike]): Input buffer to read table from.
+            format (Union[FileFormat, str]): Format of the table as stored
+            in stream or filepath.
+            columns (List[str], Optional): Columns to read.
+            filters (List[Tuple], Optional): Row filters to apply while reading.
+        Returns:
+            Table: Arrow table read from the specified source.
+        """
+        if format == FileFormat.PARQUET:
+            return pq.read_table(input, columns=columns, filters=filters, **kwargs)
+        if format == FileFormat.FEATHER:
+            return feather.read_table(input, columns=columns, **kwargs)
+
+        return self.__read_csv_table(input, columns, **kwargs)
+
+    def __iter_parquet(
+        self,
+        input: Union[IO, os.PathLike],
+        chunksize: int,
+        columns: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lazily reads a Parquet file in record batches.
+        Args:
+            input (Union[IO, os.PathLike]): Input buffer to read batches from.
+            chunksize (int): Maximum number of rows per data frame.
+            columns (List[str], Optional): Columns to read.
+        Returns:
+            Iterator[DataFrame]: Data frames of at most chunksize rows.
+        """
+        parquet_file = pq.ParquetFile(input, **kwargs)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas(types_mapper=_arrow_types_mapper,
+                                  split_blocks=True, self_destruct=True)
+
     def _read(
         self,
         input: Union[IO, os.PathLike],
         format: Union[FileFormat, str],
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple]] = None,
+        backend: str = 'pyarrow',
+        chunksize: Optional[int] = None,
         **kwargs,
-    ) -> pd.DataFrame:
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Loads the data frame from the filepath or buffer specified.
         Args:
@@ -90,35 +267,69 @@ class BaseFile(BaseIO):
             Can be a stream or a filepath.
             format (Union[FileFormat, str]): Format of the data frame as stored
             in stream or filepath.
+            columns (List[str], Optional): Columns to read. Defaults to None, in
+            which case all columns are read.
+            filters (List[Tuple], Optional): Row filters in DNF form, e.g.
+            [('year', '>=', 2020)]. Only supported for Parquet files, where row
+            groups excluded by their statistics are skipped.
+            backend (str): Reader backend, either 'pyarrow' or 'pandas'. JSON
+            files are always read with pandas. The pyarrow backend keeps columns
+            arrow-backed, parses CSVs in parallel and accepts the
+            pandas style sep (a single character), dtype (a dict) and
+            parse_dates (a list of columns) arguments. CSVs read with any
+            other argument or form, a dtype arrow can't express or from an
+            unseekable stream fall back to pandas. Defaults to 'pyarrow'.
+            chunksize (int, Optional): If set, returns an iterator of data frames
+            with at most chunksize rows instead of a single data frame. Parquet
+            files are streamed by record batch, CSV and JSON files use the pandas
+            reader's chunksize. Defaults to None.
+        Raises:
+            ValueError: Raised if filters are given for a non Parquet format or
+            together with chunksize, or if an invalid backend is specified.
         Returns:
-            DataFrame: Data frame object loaded from the specified data frame.
+            Union[DataFrame, Iterator[DataFrame]]: Data frame object loaded from the
+            specified data frame, or an iterator of data frames if chunksize is set.
         """
-        reader = self.__get_reader(format)
+        if backend not in ('pyarrow', 'pandas'):
+            raise ValueError(f'Invalid backend \'{backend}\' specified.')
+        if filters is not None and format != FileFormat.PARQUET:
+            raise ValueError(f'Filters are not supported for format \'{format}\'.')
+        if filters is not None and chunksize is not None:
+            raise ValueError('Filters are not supported together with chunksize.')
+
+        if chunksize is not None and format == FileFormat.PARQUET:
+            return self.__iter_parquet(input, chunksize, columns, **kwargs)
+
+        if (backend == 'pyarrow' and chunksize is None
+                and format in (FileFormat.CSV, FileFormat.FEATHER, FileFormat.PARQUET)
+                and (format != FileFormat.CSV or self.__arrow_csv_supported(input, kwargs))):
+            table = self.__read_table(input, format, columns, filters, **kwargs)
+            df = table.to_pandas(types_mapper=_arrow_types_mapper,
+                                 split_blocks=True, self_destruct=True)
+            for col in kwargs.get('parse_dates') or []:
+                df[col] = pd.to_datetime(df[col])
+            return df
+
+        if format == FileFormat.PARQUET:
+            kwargs.update(columns=columns, filters=filters)
+        elif format == FileFormat.CSV:
+            kwargs.update(usecols=columns)
+        elif format == FileFormat.FEATHER:
+            kwargs.update(columns=columns)
+        if chunksize is not None:
+            kwargs.update(chunksize=chunksize)
+
+        reader = _READERS.get(format)
+        if reader is None:
+            raise ValueError(f'Invalid format \'{format}\' specified.')
         df = reader(input, **kwargs)
+
+        if columns is not None and format == FileFormat.JSON:
+            if chunksize is not None:
+                return (chunk[columns] for chunk in df)
+            df = df[columns]
         return df
     
-    def __get_writer(
-        self,
-        df: pd.DataFrame,
-        format: Union[FileFormat, str],
-    ) -> Callable:
-        """
-        Fetches the appropriate file writer based on format
-        Args:
-            df (DataFrame): Data frame to get file writer for.
-            format (Union[FileFormat, str]): Format to write the data frame as.
-        Returns:
-            Callable: File writer method
-        """
-        if format == FileFormat.CSV:
-            return df.to_csv
-        elif format == FileFormat.JSON:
-            return df.to_json
-        elif format == FileFormat.PARQUET:
-            return df.to_parquet
-        else:
-            raise ValueError(f'Unexpected format provided: {self.format}')
-    
     def _write(
         self,
         df: pd.DataFrame,
@@ -133,8 +344,10 @@ class BaseFile(BaseIO):
             format (Union[FileFormat, str]): Format to write the data frame as.
             output (Union[IO, os.PathLike]): Output stream/filepath to write data frame to.
         """
-        writer = self.__get_writer(df, format)
-        writer(output, **kwargs)
+        writer = _WRITERS.get(format)
+        if writer is None:
+            raise ValueError(f'Unexpected format provided: {format}')
+        getattr(df, writer)(output, **kwargs)
 
 class BaseSQLDatabase(BaseIO):
     """
@@ -152,7 +365,14 @@ class BaseSQLDatabase(BaseIO):
         """
         pass
 
-    def sample(self, schema: str, table: str, size: int = 10000, **kwargs) -> pd.DataFrame:
+    def sample(
+        self,
+        schema: str,
+        table: str,
+        size: int = 10000,
+        chunksize: Optional[int] = None,
+        **kwargs,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Sample data from a table in the connected database. Sample is not
         guaranteed to be random.
@@ -160,10 +380,20 @@ class BaseSQLDatabase(BaseIO):
             schema (str): The schema to select the table from.
             size (int): The number of rows to sample. Defaults to 10,000
             table (str): The table to sample from in the connected database.
+            chunksize (int, Optional): If set, the sample is streamed as an iterator
+            of data frames with at most chunksize rows. Defaults to None.
+        Raises:
+            ValueError: Raised if schema or table are not valid SQL identifiers.
         Returns:
-            DataFrame: Sampled data from the data frame.
+            Union[DataFrame, Iterator[DataFrame]]: Sampled data from the data frame,
+            or an iterator of data frames if chunksize is set.
         """
-        return self.load(f'SELECT * FROM {schema}.{table} LIMIT {str(size)};', **kwargs)
+        for identifier in (schema, table):
+            if not (isinstance(identifier, str) and _SQL_IDENTIFIER.fullmatch(identifier)):
+                raise ValueError(f'Invalid SQL identifier \'{identifier}\' specified.')
+        if chunksize is not None:
+            kwargs.update(chunksize=chunksize)
+        return self.load(f'SELECT * FROM {schema}.{table} LIMIT {int(size)};', **kwargs)
 
     def _clean_query(self, query_string: str) -> str:
         """
@@ -1,5 +1,6 @@
+import os
 import pandas as pd
-from typing import Union
+from typing import Iterator, List, Optional, Tuple, Union
 from feature_store.data_extraction.base import BaseFile, FileFormat
 
 class FileIO(BaseFile):
@@ -11,21 +12,40 @@ class FileIO(BaseFile):
         self,
         filepath: str,
         format: FileFormat = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple]] = None,
+        backend: str = 'pyarrow',
+        chunksize: Optional[int] = None,
         **kwargs
-    ) -> pd.DataFrame:
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Loads the data frame from the filepath specified.
         Args:
             filepath (os.PathLike): Filepath to load data frame from.
             format (Union[FileFormat, str], Optional): Format of the file to load data frame from.
             Defaults to None, in which case the format is inferred.
+            columns (List[str], Optional): Columns to load. Defaults to None, in which
+            case all columns are loaded.
+            filters (List[Tuple], Optional): Row filters pushed down to Parquet reads,
+            e.g. [('year', '>=', 2020)]. Defaults to None.
+            backend (str): Reader backend, 'pyarrow' or 'pandas'. Use 'pandas' to pass
+            pandas reader arguments through kwargs. Defaults to 'pyarrow'.
+            Local Parquet and Feather files are memory-mapped by the pyarrow backend.
+            chunksize (int, Optional): Number of rows per chunk. When set, an iterator
+            of data frames is returned instead of a single data frame. Defaults to None.
         Returns:
-            DataFrame: Data frame object loaded from the specified data frame.
+            Union[DataFrame, Iterator[DataFrame]]: Data frame object loaded from the
+            specified data frame, or an iterator of data frames if chunksize is set.
         """
         if format is None:
             format = self._get_file_format(filepath)
+        if ((format == FileFormat.PARQUET and (backend == 'pyarrow' or chunksize is not None)
+                or format == FileFormat.FEATHER and backend == 'pyarrow')
+                and isinstance(filepath, (str, os.PathLike)) and os.path.isfile(filepath)):
+            kwargs.setdefault('memory_map', True)
         print(f'Loading data frame from \'{filepath}\'')
-        return self._read(filepath, format, **kwargs)
+        return self._read(filepath, format, columns=columns, filters=filters,
+                          backend=backend, chunksize=chunksize, **kwargs)
     
     def export(
         self,
@@ -1,4 +1,7 @@
 import bisect
+import numpy as np
+
+__all__ = ['find_le', 'find_le_bulk']
 
 def find_le(ls: list, x: int) -> list:
     """
@@ -12,4 +15,27 @@ def find_le(ls: list, x: int) -> list:
     i = bisect.bisect_right(ls, x)
     if i:
         return ls[i-1]
-    raise ValueError
\ No newline at end of file
+    raise ValueError
+
+def find_le_bulk(ls: np.ndarray, xs: np.ndarray) -> tuple:
+    """
+    Vectorized find_le. Receives ordered array ls and array of
+    elements xs and returns, for every element, the rightmost
+    value of ls less than or equal to it.
+    Args:
+        ls (np.ndarray): ordered array of int
+        xs (np.ndarray): elements to find
+    Returns:
+        tuple: Array of found values and boolean mask of elements
+        that have one. Values where the mask is False are undefined.
+    """
+
+    ls = np.asarray(ls)
+    xs = np.asarray(xs)
+
+    idx = np.searchsorted(ls, xs, side='right') - 1
+    valid = idx >= 0
+
+    out = np.empty(xs.shape, dtype=ls.dtype)
+    out[valid] = ls[idx[valid]]
+    return out, valid
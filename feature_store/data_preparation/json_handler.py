@@ -4,6 +4,21 @@ from typing import Any
 
 import orjson
 
+def _pluck_dict_keys(series: pd.Series, keys: list) -> dict:
+    """
+    Extracts the requested keys from a Series of dicts, one list of
+    values per key, with None where a dict lacks the key.
+    Args:
+        series (pd.Series): Series of dicts.
+        keys (list): Dict keys to extract.
+    Returns:
+        dict: Lists of values per key.
+    """
+
+    records = series.tolist()
+
+    return {key: [record.get(key) for record in records] for key in keys}
+
 def get_json_value(df: pd.DataFrame, col: str) -> pd.DataFrame:
     """
     Takes a pandas dataframe and a string column-name.
@@ -17,19 +32,16 @@ def get_json_value(df: pd.DataFrame, col: str) -> pd.DataFrame:
         DataFrame: Data with json column normalized
     """
 
-    try:
-        df = df.copy()
-    except Exception as e:
-        raise(e)
-
     try:
         data = pd.json_normalize(
             df[col].apply(
-                orjson.loads), max_level=0)
+                orjson.loads).tolist(), max_level=0)
+        data.index = df.index
     except KeyError as e:
         return df
     else:
-        col_lst = data.columns.difference(df.columns)
+        existing = set(df.columns)
+        col_lst = [c for c in data.columns if c not in existing]
         return df.join(data[col_lst])
 
 def extract_value_dict(data: dict, key: str,
@@ -46,12 +58,7 @@ def extract_value_dict(data: dict, key: str,
 
     """
 
-    try:
-        status = data.get(key, default)
-    except AttributeError as e:
-        raise(e)
-
-    return status
+    return data.get(key, default)
 
 def map_normalize_dict(df: pd.DataFrame,
                         col: str,
@@ -68,11 +75,9 @@ def map_normalize_dict(df: pd.DataFrame,
     Returns:
         DataFrame: Data with json normalized as new columns
     """
-    df = df.copy()
+    keys = list(dict.fromkeys(map.values()))
+    values = _pluck_dict_keys(df[col], keys)
 
-    for new_col_name, dict_key in map.items():
-        df.loc[:, new_col_name] = df[col].apply(
-            lambda x: extract_value_dict(
-                data=x, key=dict_key))
-                
-    return df.fillna(value=np.nan)
\ No newline at end of file
+    return df.assign(**{new_col_name: values[dict_key]
+                        for new_col_name, dict_key in map.items()}
+                    ).fillna(value=dict.fromkeys(map, np.nan))
\ No newline at end of file
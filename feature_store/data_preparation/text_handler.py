@@ -2,6 +2,8 @@ import re
 import numpy as np
 import pandas as pd
 
+__all__ = ['apply_regex_series']
+
 def apply_regex_series(series: pd.Series,
                         regex: re.Pattern,
                         handle_nan=True) -> np.array:
@@ -14,13 +16,14 @@ def apply_regex_series(series: pd.Series,
         handle_nan (bool): True if you want to return 0 when
         value is nan, otherwise nan is passed to regex.
     Returns:
-        np.array: Numpy array containing 1 for every match
+        np.array: Numpy int8 array containing 1 for every match
         and 0 for no match.
     """
 
-    if handle_nan:
-        return (np.where(
-            series.str.contains(regex) & series.notna(), 1, 0))
-    else:
-        return (np.where(
-            series.str.contains(regex), 1, 0))
\ No newline at end of file
+    if (isinstance(series.dtype, pd.ArrowDtype)
+            or getattr(series.dtype, 'storage', None) == 'pyarrow'):
+        # pandas' arrow string methods don't take compiled patterns
+        series = series.astype(object)
+
+    mask = series.str.contains(regex, na=not handle_nan)
+    return mask.to_numpy(dtype=np.int8)
@@ -0,0 +1,67 @@
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+__all__ = ['star_lookup']
+
+def _star_lookup_numpy(y: np.array, x: np.array, table: np.array) -> np.array:
+    """
+    Gathers the number of stars of each application from the star table.
+    The last row of the table stands for saturated declaration counts.
+
+    Args:
+        y (np.array): Array of number of times IRPF declared.
+        x (np.array): Array of number of times tax refunded.
+        table (np.array): int8 matrix of stars.
+    Returns:
+        np.array: int8 array of number of IRPF stars, -1 when invalid.
+    """
+
+    saturated = table.shape[0] - 1
+
+    oob = (y < 0) | (x < 0) | (x >= table.shape[1])
+    y = np.clip(y, 0, saturated)
+    stars = table[y, np.where(oob, 0, x)]
+    stars[oob & (y < saturated)] = -1
+
+    return stars
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _star_lookup_numba(y, x, table):
+        saturated = table.shape[0] - 1
+        out = np.empty(y.size, np.int8)
+        for i in prange(y.size):
+            yi = y[i]
+            xi = x[i]
+            if yi >= saturated:
+                out[i] = table[saturated, 0]
+            elif yi < 0 or xi < 0 or xi >= table.shape[1]:
+                out[i] = -1
+            else:
+                out[i] = table[yi, xi]
+        return out
+
+def star_lookup(y: np.array, x: np.array, table: np.array) -> np.array:
+    """
+    Retrieve number of stars based on array of declarations and array of
+    refunds, JIT-compiled with numba when it is installed.
+
+    Args:
+        y (np.array): Array of number of times IRPF declared.
+        x (np.array): Array of number of times tax refunded.
+        table (np.array): int8 matrix of stars.
+    Returns:
+        np.array: int8 array of number of IRPF stars, -1 when invalid.
+    """
+
+    y = np.ascontiguousarray(y, dtype=np.int64)
+    x = np.ascontiguousarray(x, dtype=np.int64)
+
+    if njit is None:
+        return _star_lookup_numpy(y, x, table)
+
+    return _star_lookup_numba(y, x, table)
@@ -1,35 +1,112 @@
 import os
+import hashlib
+import tempfile
+import functools
+import contextlib
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 
 from feature_store.data_extraction.file_io import FileIO
 
 DIR_PATH = os.path.abspath(os.path.dirname(__file__))
 
-def get_irpf_df():
-    fpath = os.path.join(DIR_PATH, '../data/input.csv')
-    return file_reader.load(fpath,
-                        sep=';',
-                        parse_dates=['time_stamp'],
-                        dtype={'bank_code_pl': str,
-                                'branch_number_pl': str,
-                                'loan_id': str})
+IRPF_CATEGORY_COLS = ['bank_code_pl', 'branch_number_pl', 'product_code', 'state', 'loan_id']
 
-def get_bank_df():
+IRPF_CSV_ARGS = {
+    'sep': ';',
+    'parse_dates': ['time_stamp'],
+    'dtype': {'bank_code_pl': str,
+              'branch_number_pl': str,
+              'loan_id': str}}
+
+# Sidecars are keyed by the read arguments and category columns, so
+# changing either in code stops serving a sidecar typed the old way.
+_SIDECAR_KEY = hashlib.sha1(repr((IRPF_CSV_ARGS, IRPF_CATEGORY_COLS)).encode()).hexdigest()[:12]
+
+@functools.lru_cache(maxsize=1)
+def _reader():
+    return FileIO()
+
+def _write_sidecar(df, cache_path, reader):
+    # Written next to the target and renamed over it, so readers never see a
+    # partial file. A sidecar that can't be written just means no cache.
+    try:
+        fd, tmp_path = tempfile.mkstemp(suffix='.feather', dir=os.path.dirname(cache_path))
+    except OSError:
+        return
+    os.close(fd)
+    try:
+        reader.export(df, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+def _normalize_irpf_dtypes(df):
+    # Feather reads timestamps back arrow-backed and category levels as
+    # objects, so both load paths are cast to the same dtypes.
+    return df.astype({
+        'time_stamp': 'datetime64[ns]',
+        **{col: pd.CategoricalDtype(df[col].cat.categories.astype(object))
+           for col in IRPF_CATEGORY_COLS}})
+
+def load_irpf_csv(fpath, reader):
+    cache_path = f'{fpath}.{_SIDECAR_KEY}.feather'
+
+    # The typed Feather sidecar is reused until the CSV is modified.
+    if (os.path.isfile(cache_path)
+            and os.path.getmtime(cache_path) >= os.path.getmtime(fpath)):
+        return _normalize_irpf_dtypes(reader.load(cache_path))
+
+    df = reader.load(fpath, **IRPF_CSV_ARGS)
+    df = _normalize_irpf_dtypes(df.astype(dict.fromkeys(IRPF_CATEGORY_COLS, 'category')))
+    _write_sidecar(df, cache_path, reader)
+    return df
+
+@functools.lru_cache(maxsize=1)
+def _load_irpf_df():
+    df = load_irpf_csv(os.path.join(DIR_PATH, '../data/input.csv'), _reader())
+    df['bank_code_pl'] = df['bank_code_pl'].str.zfill(3).astype('category')
+    df['branch_number_pl'] = df['branch_number_pl'].str.zfill(4).astype('category')
+    return df
+
+@functools.lru_cache(maxsize=1)
+def _load_bank_df():
     fpath = os.path.join(DIR_PATH, '../data/bank.parquet')
-    df = file_reader.load(fpath)
+    df = _reader().load(fpath)
     df = df.rename(columns={
         'BankName': 'bank',
         'Codigo_Banco': 'bank_code'})
+    df = df.fillna('###').astype({'bank': 'category', 'bank_code': 'category'})
     return df
 
-def get_branch_df():
+@functools.lru_cache(maxsize=1)
+def _load_branch_df():
     fpath = os.path.join(DIR_PATH, '../data/bank_branch.parquet')
-    branch_df = file_reader.load(fpath)
+    branch_df = _reader().load(fpath)
     branch_df = branch_df.rename(columns={
         'Bank': 'bank_code',
         'Branch': 'branch'})
+    branch_df = branch_df.astype({
+        'bank_code': 'category',
+        'branch': 'category',
+        'branch_code': 'category'})
 
     return branch_df
 
+# Loaders are memoized, getters hand out shallow copies so callers
+# adding or dropping columns don't alter the cached frames.
+def get_irpf_df():
+    return _load_irpf_df().copy(deep=False)
+
+def get_bank_df():
+    return _load_bank_df().copy(deep=False)
+
+def get_branch_df():
+    return _load_branch_df().copy(deep=False)
+
 def load_dataset(dataset):
     datasets = {
             'irpf': get_irpf_df,
@@ -39,9 +116,9 @@ def load_dataset(dataset):
     
     return datasets.get(dataset, None)()
 
-    
-
-
-
-
-file_reader = FileIO()
\ No newline at end of file
+def load_datasets(datasets):
+    # File decoding releases the GIL, so independent datasets load in parallel.
+    if not datasets:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(datasets)) as executor:
+        return dict(zip(datasets, executor.map(load_dataset, datasets)))
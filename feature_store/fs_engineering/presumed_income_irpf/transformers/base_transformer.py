@@ -1,9 +1,40 @@
-from feature_store.data_preparation import text_handler, array_handler
+from feature_store.data_preparation import array_handler, text_handler
+from feature_store.fs_engineering.presumed_income_irpf._kernels import star_lookup
 
 import re
 import pandas as pd
 import numpy as np
 
+# Status patterns are compiled once at import instead of on every call.
+REGEX_NOT_CONSULTED = re.compile(
+    r'(?:^\s*$|\bdata\sde\snascimento\sinformada\b'
+    r'.*\bestá\sdive|\bnão\scoletado'
+    r'|\bocorreu\suma\sinconsistência\s?[.])'
+    , re.IGNORECASE)
+
+REGEX_NOT_DECLARED = re.compile(
+    r'(?:\bconsta\sapresentação\sde\sdeclaração\sanual'
+    r'\sde\sisento\b|\bapresentação\sda\sdeclaração\s'
+    r'como\sisento\b|\bdeclaração\sconsta\scomo\sisento\b'
+    r'|\bdeclaração\sconsta\scomo\spedido\sde'
+    r'\sregularização\b|\bsua\sdeclaração\snão\sconsta'
+    r'\sna\sbase\sde\sdados\b|\bainda\snão\sestá\sna'
+    r'\sbase\b)', re.IGNORECASE)
+
+REGEX_TAX_REFUND = re.compile(
+    r'(?:\bsituação\sda\srestituição[:]\screditada\b'
+    r'|\bsomente\sserá\spermitida\spor\smeio\sdo\scódigo\sde\sacesso\b'
+    r'|\baguardando\sreagendamento\spelo\scontribuinte[.]?'
+    r'|\bdevolvida\sà\sreceita\sfederal[,]?\sem\srazão\sdo\snão\sresgate\b'
+    r'|\benviada\spara\scrédito\sno\sbanco\b'
+    r'|\breagendada\spara\scrédito\sno\sbanco\b'
+    r'|\bdados\sda\sliberação\sde\ssua\srestituição\b'
+    r'|\bdeclaração\sestá\sna\sbase\sde\sdados\b'
+    r'|\bestá\sna\sbase[,]\sutilize\so\sextrato\b'
+    r'|\bdeclaração\sjá\sfoi\sprocessada[.]?$'
+    r'|\brestituição[:]\saguardando\sdevolução\spelo\sbanco\b)'
+    , re.IGNORECASE)
+
 def explode_dict_col(df: pd.DataFrame,
                     dict_col='riskInfo',
                     tax_report_col_name='tax_report_data') -> pd.DataFrame:
@@ -18,15 +49,11 @@ def explode_dict_col(df: pd.DataFrame,
         pd.DataFrame: New dataframe with exploded col as rows.
     """
 
-    df = df.copy()
-
-    df.loc[:, tax_report_col_name] = (
-        df[dict_col].apply(
-            lambda x: x.values()))
-
-    df = df.apply(pd.Series.explode).reset_index(drop=True).copy()
-
-    return df
+    # Exploding the dict itself yields its keys (report years), aligned
+    # with the values exploded into tax_report_col_name.
+    return df.assign(**{
+        tax_report_col_name: df[dict_col].map(lambda x: list(x.values()))
+        }).explode([dict_col, tax_report_col_name], ignore_index=True)
 
 def get_irpf_status(df: pd.DataFrame, text_col: str) -> pd.DataFrame:
     """
@@ -39,85 +66,26 @@ def get_irpf_status(df: pd.DataFrame, text_col: str) -> pd.DataFrame:
         pd.DataFrame: Dataframe with IRPF status as columns
     """
 
-    df = df.copy()
-
-    regex_not_consulted = re.compile(
-        r'(?:^\s*$|\bdata\sde\snascimento\sinformada\b'
-        r'.*\bestá\sdive|\bnão\scoletado'
-        r'|\bocorreu\suma\sinconsistência\s?[.])'
-        , re.IGNORECASE)
-
-    regex_not_declared = re.compile(
-        r'(?:\bconsta\sapresentação\sde\sdeclaração\sanual'
-        r'\sde\sisento\b|\bapresentação\sda\sdeclaração\s'
-        r'como\sisento\b|\bdeclaração\sconsta\scomo\sisento\b'
-        r'|\bdeclaração\sconsta\scomo\spedido\sde'
-        r'\sregularização\b|\bsua\sdeclaração\snão\sconsta'
-        r'\sna\sbase\sde\sdados\b|\bainda\snão\sestá\sna'
-        r'\sbase\b)', re.IGNORECASE)
-
-    regex_tax_refund = re.compile(
-        r'(?:\bsituação\sda\srestituição[:]\screditada\b'
-        r'|\bsomente\sserá\spermitida\spor\smeio\sdo\scódigo\sde\sacesso\b'
-        r'|\baguardando\sreagendamento\spelo\scontribuinte[.]?'
-        r'|\bdevolvida\sà\sreceita\sfederal[,]?\sem\srazão\sdo\snão\sresgate\b'
-        r'|\benviada\spara\scrédito\sno\sbanco\b'
-        r'|\breagendada\spara\scrédito\sno\sbanco\b'
-        r'|\bdados\sda\sliberação\sde\ssua\srestituição\b'
-        r'|\bdeclaração\sestá\sna\sbase\sde\sdados\b'
-        r'|\bestá\sna\sbase[,]\sutilize\so\sextrato\b'
-        r'|\bdeclaração\sjá\sfoi\sprocessada[.]?$'
-        r'|\brestituição[:]\saguardando\sdevolução\spelo\sbanco\b)'
-        , re.IGNORECASE)
-    
-    col_list = ['irpf_extraction_error', 'irpf_not_declared', 'irpf_tax_refund']
-
-    df.loc[:, 'irpf_extraction_error'] = text_handler.apply_regex_series(
-        df[text_col], regex_not_consulted, handle_nan=False)
-    df.loc[:, 'irpf_not_declared'] = text_handler.apply_regex_series(
-        df[text_col], regex_not_declared)
-    df.loc[:, 'irpf_tax_refund'] = text_handler.apply_regex_series(
-        df[text_col], regex_tax_refund)
-
-    df.loc[:, 'irpf_tax_to_pay'] = df[col_list].apply(
-        lambda x: 1 not in x.values, axis=1).astype(int)
-
-    return df
-
-def retrieve_stars(num_declarations: int,
-                    num_refunds: int,
-                    star_arr: np.array) -> int:
+    irpf_extraction_error = text_handler.apply_regex_series(
+        df[text_col], REGEX_NOT_CONSULTED, handle_nan=False)
+    irpf_not_declared = text_handler.apply_regex_series(
+        df[text_col], REGEX_NOT_DECLARED)
+    irpf_tax_refund = text_handler.apply_regex_series(
+        df[text_col], REGEX_TAX_REFUND)
+
+    return df.assign(
+        irpf_extraction_error=irpf_extraction_error,
+        irpf_not_declared=irpf_not_declared,
+        irpf_tax_refund=irpf_tax_refund,
+        irpf_tax_to_pay=((irpf_extraction_error | irpf_not_declared | irpf_tax_refund) == 0)
+                        .astype(np.int8))
+
+def _build_star_table() -> np.array:
     """
-    Retrives number of stars of a single IRPF application based on number
-    of declarations and tax refunds.
-    Args:
-        num_declarations (int): Number of times IRPF declared.
-        num_refunds (int): Number of times tax refunded.
-        star_arr: Matrix of stars where y is number of declarations and x
-        is number of refunds.
+    Builds the star matrix where y is number of declarations and x is number
+    of refunds. An extra row of 5s stands for 16 or more declarations.
     Returns:
-        int: Number of stars of application
-    """
-
-    try:
-        if num_declarations >= 16:
-            stars = 5
-        else:
-            stars = star_arr[num_declarations][num_refunds]
-    except IndexError:
-        return -1
-    else:
-        return stars
-
-def set_star_number(arr_declarations: np.array,
-                    arr_refunds: np.array) -> np.array:
-    """
-    Retrieve number of stars based on array of declarations and array of refunds.
-    Args:
-        arr_declarations (int): Array of umber of times IRPF declared.
-        arr_refunds (int): Array of umber of times tax refunded.
-    Returns:
-        np.array: Array of number of IRPF stars.
+        np.array: int8 matrix of stars with 17 rows.
     """
 
     base_arr = [
@@ -147,88 +115,113 @@ def set_star_number(arr_declarations: np.array,
         mode='constant',
         constant_values=default_value) for arr in base_arr]
 
-    return np.array([retrieve_stars(y, x, star_array)
-                        for y, x in zip(arr_declarations, arr_refunds)])
+    return np.vstack(star_array + [np.full(max_len, 5)]).astype(np.int8)
+
+STAR_TABLE = _build_star_table()
+
+INCOME_BRANCHES = ['ESTR', 'PERS', 'STIL', 'PRIM', 'OUTR',
+                    'HSBC', 'VANG', 'UNIC', 'ESPA', 'PRIV']
 
+NO_INCOME = np.iinfo(np.int64).min
 
-def get_presumed_income(year: int,
-                        irpf_dict: dict,
-                        branch_pl: str,
-                        star_dict: dict,
-                        year_list: list) -> np.array:
+def set_star_number(arr_declarations: np.array,
+                    arr_refunds: np.array) -> np.array:
     """
-    Get the presumed income of a single CPF for a loan application
-    based on past IRPF data.
+    Retrieve number of stars based on array of declarations and array of refunds.
     Args:
-        year (int): Year of loan application.
-        irpf_dict (dict): Dict of past IRPF declarations
-        based on bank branchs.
-        branch_pl (str): Code of bank branch of loan application.
-        star_dict (dict): Base dict of stars to retrieve presumed income
-        based on brank branch.
-        year_list (list): List of years present in star_dict.
+        arr_declarations (int): Array of umber of times IRPF declared.
+        arr_refunds (int): Array of umber of times tax refunded.
     Returns:
         np.array: Array of number of IRPF stars.
     """
-    year_d = str(array_handler.find_le(year_list, year))
-    
-    presumed_income_set = set()
-
-    for key, value in irpf_dict.items():
-        if int(value) > 7:
-            value = '7'
-        
-        presumed_income_set.add(
-            star_dict.get(year_d)
-            .get(key)
-            .get(value)
-        )
-
-    if int(irpf_dict.get('ESTR')) > 0:
-        declared_branch_incm = (star_dict.get(year_d, {})
-                            .get(branch_pl, {})
-                            .get('1', 0))
-
-        presumed_income_set.add(
-            declared_branch_incm
-        )
-
-    return max(presumed_income_set)
+
+    return star_lookup(arr_declarations, arr_refunds, STAR_TABLE)
+
+
+def parse_income_dict(income_dict: dict) -> dict:
+    """
+    Converts the year and star keys of the JSON loaded base dict of
+    presumed incomes to int.
+    Args:
+        income_dict (dict): Base dict of stars as loaded from JSON.
+    Returns:
+        dict: Same dict keyed by int year, branch and int stars.
+    """
+
+    return {int(year): {branch: {int(stars): income for stars, income in incomes.items()}
+                        for branch, incomes in branches.items()}
+            for year, branches in income_dict.items()}
+
+def build_income_table(income_dict: dict) -> tuple:
+    """
+    Flattens the base dict of presumed incomes into an array indexed by
+    year, bank branch and number of stars.
+    Args:
+        income_dict (dict): Base dict of stars to retrieve presumed income
+        based on brank branch, as returned by parse_income_dict.
+    Returns:
+        tuple: Sorted array of years and income array of shape
+        (years, branches, 8), NO_INCOME where the dict has no entry.
+    """
+
+    year_list = sorted(income_dict.keys())
+
+    table = np.full((len(year_list), len(INCOME_BRANCHES), 8), NO_INCOME, dtype=np.int64)
+
+    for yi, year in enumerate(year_list):
+        for bi, branch in enumerate(INCOME_BRANCHES):
+            for stars, income in income_dict[year].get(branch, {}).items():
+                table[yi, bi, stars] = income
+
+    return np.array(year_list), table
 
 def calculate_presumed_income(df: pd.DataFrame,
-                                income_dict: dict) -> pd.Series:
+                                income_dict: dict,
+                                income_table: tuple = None) -> pd.Series:
     """
     Calculate presumed income of a dict of cpfs with one-hot encoded
     IRPF declarations and refunds.
     Args:
         df (pd.DataFrame): Dataframe with data to calculate presumed income.
         income_dict (dict): Base dict of stars to retrieve presumed income
-        based on brank branch.
+        based on brank branch, as returned by parse_income_dict.
+        income_table (tuple, Optional): income_dict as returned by
+        build_income_table. Defaults to None, in which case it is built.
+    Raises:
+        ValueError: Raised if an application year is earlier than every
+        year in the income table.
     Returns:
         pd.Series: Pandas Series with presumed income per CPF.
     """
 
-    year_list = [int(x) for x in list(income_dict.keys())]
-    year_list.sort()
-
-    branch_codes = ['year', 'ESTR', 'PERS', 'STIL',
-                'PRIM', 'OUTR', 'HSBC', 'VANG',
-                'UNIC', 'ESPA', 'PRIV', 'branch_code_pl']
-
-    return df.loc[:, branch_codes].apply(
-            lambda x: get_presumed_income(
-                x[0],
-                {'ESTR': str(x[1]),
-                'PERS': str(x[2]),
-                'STIL': str(x[3]),
-                'PRIM': str(x[4]),
-                'OUTR': str(x[5]),
-                'HSBC': str(x[6]),
-                'VANG': str(x[7]),
-                'UNIC': str(x[8]),
-                'ESPA': str(x[9]),
-                'PRIV': str(x[10])},
-                x[11],
-                income_dict,
-                year_list
-            ), axis=1, raw=False)
\ No newline at end of file
+    if income_table is None:
+        income_table = build_income_table(income_dict)
+    year_list, table = income_table
+
+    years = df['year'].to_numpy()
+    year_d, valid = array_handler.find_le_bulk(year_list, years)
+    if not valid.all():
+        raise ValueError(
+            f'No presumed income reference for years {sorted(set(years[~valid].tolist()))}, '
+            f'the first reference year is {year_list[0]}.')
+    yi = np.searchsorted(year_list, year_d)
+
+    # Negative counts (invalid ESTR stars) have no income, counts above 7
+    # share the last column.
+    counts = df[INCOME_BRANCHES].to_numpy(dtype=np.int64)
+    incomes = table[yi[:, None], np.arange(len(INCOME_BRANCHES)), np.clip(counts, 0, 7)]
+    incomes[counts < 0] = NO_INCOME
+
+    # Applications with ESTR stars also get the 1 star income of the
+    # declared branch, or 0 when the branch is unknown.
+    bi = pd.Index(INCOME_BRANCHES).get_indexer(df['branch_code_pl'])
+    declared = np.where(bi >= 0, table[yi, bi, 1], 0)
+    declared[declared == NO_INCOME] = 0
+    declared[counts[:, 0] <= 0] = NO_INCOME
+
+    presumed_income = np.maximum(incomes.max(axis=1), declared)
+
+    if (presumed_income == NO_INCOME).any():
+        presumed_income = np.where(presumed_income == NO_INCOME, np.nan, presumed_income)
+
+    return pd.Series(presumed_income, index=df.index)
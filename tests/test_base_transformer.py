@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store.data_preparation import array_handler
+from feature_store.fs_engineering.presumed_income_irpf.transformers import base_transformer
+
+INCOME_DICT = {
+    2018: {branch: {stars: 1000 * (i + 1) + 100 * stars for stars in range(8)}
+           for i, branch in enumerate(base_transformer.INCOME_BRANCHES)},
+    2020: {'ESTR': {0: 0, 1: 500, 2: 900},
+           'PERS': {1: 3000, 2: 4000}},
+}
+
+# Scalar implementations the vectorized lookups replaced, kept as references.
+def retrieve_stars(num_declarations, num_refunds, star_arr):
+    try:
+        if num_declarations >= 16:
+            stars = 5
+        else:
+            stars = star_arr[num_declarations][num_refunds]
+    except IndexError:
+        return -1
+    else:
+        return stars
+
+def get_presumed_income(year, irpf_dict, branch_pl, star_dict, year_list):
+    year_d = array_handler.find_le(year_list, year)
+
+    presumed_income_set = set()
+
+    for key, value in irpf_dict.items():
+        presumed_income_set.add(
+            star_dict.get(year_d)
+            .get(key)
+            .get(min(value, 7))
+        )
+
+    if irpf_dict.get('ESTR') > 0:
+        declared_branch_incm = (star_dict.get(year_d, {})
+                            .get(branch_pl, {})
+                            .get(1, 0))
+
+        presumed_income_set.add(
+            declared_branch_incm
+        )
+
+    return max(presumed_income_set)
+
+def _applications(years, branch_code_pl='PERS', **counts):
+    return pd.DataFrame({
+        'year': years,
+        'branch_code_pl': branch_code_pl,
+        **{branch: counts.get(branch, 0) for branch in base_transformer.INCOME_BRANCHES}})
+
+def test_calculate_presumed_income_reports_years_before_table():
+    with pytest.raises(ValueError, match=r'\[2010, 2015\].*2018'):
+        base_transformer.calculate_presumed_income(
+            _applications([2015, 2019, 2010]), INCOME_DICT)
+
+def test_set_star_number_matches_reference():
+    declarations, refunds = np.meshgrid(np.arange(20), np.arange(18), indexing='ij')
+
+    stars = base_transformer.set_star_number(declarations.ravel(), refunds.ravel())
+
+    expected = [retrieve_stars(y, x, base_transformer.STAR_TABLE)
+                for y, x in zip(declarations.ravel(), refunds.ravel())]
+    np.testing.assert_array_equal(stars, expected)
+
+def test_calculate_presumed_income_matches_reference():
+    rng = np.random.default_rng(0)
+    size = 500
+    df = pd.DataFrame({branch: rng.integers(0, 10, size)
+                       for branch in base_transformer.INCOME_BRANCHES})
+    df['ESTR'] = rng.integers(0, 6, size)
+    df['year'] = rng.choice([2018, 2019], size)
+    df['branch_code_pl'] = rng.choice(base_transformer.INCOME_BRANCHES + ['XXXX', None], size)
+
+    result = base_transformer.calculate_presumed_income(df, INCOME_DICT)
+
+    expected = [get_presumed_income(row['year'],
+                                    {branch: row[branch] for branch in base_transformer.INCOME_BRANCHES},
+                                    row['branch_code_pl'], INCOME_DICT, sorted(INCOME_DICT))
+                for _, row in df.iterrows()]
+    np.testing.assert_array_equal(result.to_numpy(), expected)
+
+def test_calculate_presumed_income_skips_invalid_stars():
+    df = _applications([2019], ESTR=-1)
+
+    result = base_transformer.calculate_presumed_income(df, INCOME_DICT)
+
+    assert result.iloc[0] == max(INCOME_DICT[2018][branch][0]
+                                 for branch in base_transformer.INCOME_BRANCHES[1:])
+
+def test_calculate_presumed_income_missing_entries():
+    df = pd.concat([_applications([2021], ESTR=-1),
+                    _applications([2021], PERS=2),
+                    _applications([2021], ESTR=3)], ignore_index=True)
+
+    result = base_transformer.calculate_presumed_income(df, INCOME_DICT)
+
+    np.testing.assert_array_equal(result.to_numpy(), [np.nan, 4000, 3000])
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from feature_store.data_extraction.file_io import FileIO
+
+CSV = ('day;time_stamp;clock;name;count\n'
+       '2021-03-01;2021-03-01 10:00;10:00:00;x;1\n'
+       ';2021-03-01T10:00:00;;y;2\n')
+
+@pytest.fixture
+def csv_path(tmp_path):
+    fpath = tmp_path / 't.csv'
+    fpath.write_text(CSV)
+    return str(fpath)
+
+@pytest.mark.parametrize('kwargs', [{'dtype': str}, {'parse_dates': True}])
+def test_load_csv_falls_back_to_pandas(csv_path, kwargs):
+    df = FileIO().load(csv_path, sep=';', **kwargs)
+
+    pd.testing.assert_frame_equal(df, pd.read_csv(csv_path, sep=';', **kwargs))
+
+def test_load_csv_only_parses_requested_dates(csv_path):
+    df = FileIO().load(csv_path, sep=';', parse_dates=['time_stamp'])
+    expected = pd.read_csv(csv_path, sep=';', parse_dates=['time_stamp'])
+
+    assert df['time_stamp'].dtype == 'datetime64[ns]'
+    for col in ['day', 'clock']:
+        assert df[col].tolist() == expected[col].where(expected[col].notna(), pd.NA).tolist()
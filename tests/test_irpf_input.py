@@ -0,0 +1,34 @@
+import os
+import glob
+
+import pandas as pd
+import pytest
+
+from feature_store.data_extraction.file_io import FileIO
+from feature_store.fs_engineering.presumed_income_irpf.io.input import load_irpf_csv
+
+CSV = ('time_stamp;bank_code_pl;branch_number_pl;product_code;state;loan_id\n'
+       '2021-03-01 10:00:00;1;12;P1;SP;007\n')
+
+class _ReadOnlyDirIO(FileIO):
+    def export(self, df, filepath, format=None, **kwargs):
+        raise PermissionError(filepath)
+
+@pytest.fixture
+def csv_path(tmp_path):
+    fpath = tmp_path / 'input.csv'
+    fpath.write_text(CSV)
+    return str(fpath)
+
+def test_load_irpf_csv_reuses_sidecar(csv_path):
+    df = load_irpf_csv(csv_path, FileIO())
+
+    assert len(glob.glob(csv_path + '.*.feather')) == 1
+    pd.testing.assert_frame_equal(load_irpf_csv(csv_path, FileIO()), df)
+    assert df['loan_id'].iloc[0] == '007'
+
+def test_load_irpf_csv_without_writable_dir(csv_path):
+    df = load_irpf_csv(csv_path, _ReadOnlyDirIO())
+
+    assert sorted(os.listdir(os.path.dirname(csv_path))) == ['input.csv']
+    assert df['bank_code_pl'].dtype == 'category'
@@ -0,0 +1,21 @@
+import pytest
+
+from feature_store.data_extraction.base import BaseSQLDatabase
+
+class _QueryRecorder(BaseSQLDatabase):
+    def execute(self, query_string, **kwargs):
+        pass
+
+    def load(self, query_string, **kwargs):
+        return query_string
+
+    def export(self, df, *args, **kwargs):
+        pass
+
+def test_sample_builds_limit_query():
+    assert _QueryRecorder().sample('public', 'users', size=5) == 'SELECT * FROM public.users LIMIT 5;'
+
+@pytest.mark.parametrize('table', ['users\n', 'users; DROP TABLE users', '1users', ''])
+def test_sample_rejects_invalid_identifiers(table):
+    with pytest.raises(ValueError):
+        _QueryRecorder().sample('public', table)
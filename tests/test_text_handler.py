@@ -0,0 +1,32 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store.data_preparation.text_handler import apply_regex_series
+
+# The IRPF status patterns rely on re's semantics: $ matches before a
+# trailing newline and \s matches non-breaking spaces.
+TEXTS = ['Declaração já foi processada.\n',
+         'Enviada\xa0para crédito no banco']
+
+PATTERN = re.compile(r'(?:\bdeclaração\sjá\sfoi\sprocessada[.]?$'
+                     r'|\benviada\spara\scrédito\sno\sbanco\b)', re.IGNORECASE)
+
+@pytest.mark.parametrize('dtype', [object, pd.StringDtype('pyarrow')])
+def test_apply_regex_series_matches_like_re(dtype):
+    series = pd.Series(TEXTS + [None], dtype=dtype)
+
+    result = apply_regex_series(series, PATTERN)
+
+    np.testing.assert_array_equal(result, [1, 1, 0])
+    assert result.dtype == np.int8
+
+@pytest.mark.parametrize('dtype', [object, pd.StringDtype('pyarrow')])
+def test_apply_regex_series_keeps_re_quantifiers(dtype):
+    series = pd.Series(['y', 'xy', None], dtype=dtype)
+
+    result = apply_regex_series(series, re.compile(r'x{,2}y'), handle_nan=False)
+
+    np.testing.assert_array_equal(result, [1, 1, 1])